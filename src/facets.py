@@ -0,0 +1,86 @@
+import heapq
+from collections import Counter, defaultdict
+from itertools import combinations
+
+
+def tag_names(item):
+    """Return the item's tag names lowercased, de-duplicated and sorted."""
+    # Tag names are case-insensitive on Qiita ("Python" == "python")
+    names = {(tag.get('name') or '').lower() for tag in item.get('tags') or []}
+    names.discard('')
+    return sorted(names)
+
+
+class TagFacets:
+    """Tag, author and tag co-occurrence counts for a set of items.
+
+    Counts are updated incrementally via add()/remove(), so keeping them
+    in sync with the item list never requires rescanning it.
+    """
+
+    def __init__(self, items=()):
+        self.item_count = 0
+        self.tag_counts = Counter()
+        self.author_counts = Counter()
+        # tag -> Counter of tags appearing on the same item
+        self.cooccurrence = defaultdict(Counter)
+        for item in items:
+            self.add(item)
+
+    @staticmethod
+    def _author(item):
+        return (item.get('user') or {}).get('id') or 'unknown'
+
+    def add(self, item):
+        tags = tag_names(item)
+        self.item_count += 1
+        self.tag_counts.update(tags)
+        self.author_counts[self._author(item)] += 1
+        for a, b in combinations(tags, 2):
+            self.cooccurrence[a][b] += 1
+            self.cooccurrence[b][a] += 1
+
+    def remove(self, item):
+        tags = tag_names(item)
+        self.item_count -= 1
+        for tag in tags:
+            self._decrement(self.tag_counts, tag)
+        self._decrement(self.author_counts, self._author(item))
+        for a, b in combinations(tags, 2):
+            self._decrement_pair(a, b)
+            self._decrement_pair(b, a)
+
+    @staticmethod
+    def _decrement(counter, key):
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
+
+    def _decrement_pair(self, a, b):
+        counter = self.cooccurrence.get(a)
+        if counter is None:
+            return
+        self._decrement(counter, b)
+        if not counter:
+            del self.cooccurrence[a]
+
+    def top_tags(self, n=10):
+        return self.tag_counts.most_common(n)
+
+    def top_authors(self, n=10):
+        return self.author_counts.most_common(n)
+
+    def top_pairs(self, n=10):
+        pairs = (
+            ((a, b), count)
+            for a, counter in self.cooccurrence.items()
+            for b, count in counter.items()
+            if a < b
+        )
+        return heapq.nlargest(n, pairs, key=lambda pair: pair[1])
+
+    def cooccurring(self, tag, n=10):
+        counter = self.cooccurrence.get(tag.lower())
+        if not counter:
+            return []
+        return counter.most_common(n)
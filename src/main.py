@@ -9,8 +9,12 @@ from rich import print as rprint
 
 try:
     from qiita_client import QiitaClient
+    from facets import TagFacets
+    from similarity import SimilarityIndex
 except ImportError:
     from .qiita_client import QiitaClient
+    from .facets import TagFacets
+    from .similarity import SimilarityIndex
 
 console = Console()
 
@@ -20,6 +24,14 @@ def main():
     parser = argparse.ArgumentParser(description="List and search Qiita likes and stocks.")
     parser.add_argument("user_id", nargs="?", help="Qiita User ID")
     parser.add_argument("--search", "-s", help="Search query (e.g. 'python')")
+    parser.add_argument("--facets", "-f", action="store_true",
+                        help="Show tag/author counts and tag co-occurrence instead of the item list")
+    parser.add_argument("--facet-tag", metavar="TAG",
+                        help="Show tags co-occurring with TAG (implies --facets)")
+    parser.add_argument("--similar", type=int, metavar="NO",
+                        help="List items similar to item No. NO (numbered as in the search results if --search is given)")
+    parser.add_argument("--title-ngrams", action="store_true",
+                        help="Also use title character n-grams when ranking similar items")
     args = parser.parse_args()
 
     token = os.getenv("QIITA_ACCESS_TOKEN")
@@ -42,19 +54,40 @@ def main():
 
     # Fetch Data
     all_items = fetch_data(client, user_id)
+    all_facets = TagFacets(all_items)
+    # Only built for --similar or interactive mode; one-shot runs never need it
+    similarity_index = None
 
     current_items = all_items
+    # Facets of a filtered view are only built once asked for (None until then)
+    current_facets = all_facets
+    current_scores = None
     if args.search:
         current_items = search_items(all_items, args.search)
-        display_results_table(current_items)
+        current_facets = None
+    if args.similar is not None:
+        similarity_index = SimilarityIndex(all_items, title_ngrams=args.title_ngrams)
+        result = find_similar(similarity_index, current_items, args.similar)
+        if result is None:
+            return
+        current_items, current_scores = result
+        current_facets = None
+
+    if args.facets or args.facet_tag:
+        if current_facets is None:
+            current_facets = TagFacets(current_items)
+        display_facets(current_facets, args.facet_tag or "")
+    elif args.search or args.similar is not None:
+        display_results_table(current_items, current_scores)
     else:
         # Interactive Mode
         console.print("\n[bold]Entering interactive mode.[/bold]")
+        similarity_index = SimilarityIndex(all_items, title_ngrams=args.title_ngrams)
         display_results_table(current_items)
 
         while True:
             try:
-                prompt = "\n[bold cyan]Enter search query, item numbers (e.g. '1,3') to unlike/unstock, 'r' to reset, or 'q' to quit:[/bold cyan] "
+                prompt = "\n[bold cyan]Enter search query, item numbers (e.g. '1,3') to unlike/unstock, 'facets [tag]', 'similar <No.>', 'r' to reset, or 'q' to quit:[/bold cyan] "
                 query = console.input(prompt).strip()
             except (EOFError, KeyboardInterrupt):
                 break
@@ -67,24 +100,51 @@ def main():
 
             if query.lower() == 'r':
                 current_items = all_items
+                current_facets = all_facets
+                current_scores = None
                 display_results_table(current_items)
                 continue
 
+            facets_match = re.match(r'^facets(?:\s+(.+))?$', query, re.IGNORECASE)
+            if facets_match:
+                if current_facets is None:
+                    current_facets = TagFacets(current_items)
+                display_facets(current_facets, facets_match.group(1) or "")
+                continue
+
+            similar_match = re.match(r'^similar\s+(\d+)$', query, re.IGNORECASE)
+            if similar_match:
+                result = find_similar(similarity_index, current_items, int(similar_match.group(1)))
+                if result is not None:
+                    current_items, current_scores = result
+                    current_facets = None
+                    display_results_table(current_items, current_scores)
+                continue
+
             # Check if input is selection (numbers)
             if re.match(r'^[\d,\s]+$', query):
                 indices = [int(x.strip()) for x in query.split(',') if x.strip().isdigit()]
-                handle_selection(client, current_items, indices)
-                # Refresh data after action? Maybe not full fetch, just remove from list.
-                # For now, we remove from local list if action successful.
-                # Re-display
-                # update current_items by removing deleted ones?
-                # Actually, better to just refetch or assume success and hide.
-                # Let's remove from all_items and current_items.
-                # But handle_selection needs to return deleted IDs.
+                indexes = [all_facets, similarity_index]
+                if current_facets is not None and current_facets is not all_facets:
+                    indexes.append(current_facets)
+                removed = handle_selection(client, current_items, indices, indexes)
+                if removed:
+                    removed_ids = {item['id'] for item in removed}
+                    all_items = [item for item in all_items if item['id'] not in removed_ids]
+                    if current_scores is not None:
+                        kept = [(item, score) for item, score in zip(current_items, current_scores)
+                                if item['id'] not in removed_ids]
+                        current_items = [item for item, _ in kept]
+                        current_scores = [score for _, score in kept]
+                    else:
+                        current_items = [item for item in current_items if item['id'] not in removed_ids]
+                    display_results_table(current_items, current_scores)
                 continue
 
             # Otherwise, treat as search
             current_items = search_items(all_items, query)
+            current_facets = None
+            current_scores = None
             display_results_table(current_items)
 
 def fetch_data(client, user_id):
@@ -130,12 +190,24 @@ def search_items(items, query):
             results.append(item)
     return results
 
-def display_results_table(items):
+def find_similar(index, items, number, n=20):
+    if not 1 <= number <= len(items):
+        console.print(f"[yellow]No item with No. {number}.[/yellow]")
+        return None
+
+    target = items[number-1]
+    console.print(f"[bold]Items similar to:[/bold] {target.get('title')}")
+    results = index.similar(target, n=n)
+    return [item for item, _ in results], [score for _, score in results]
+
+def display_results_table(items, scores=None):
     table = Table(title=f"Found {len(items)} items")
     table.add_column("No.", style="cyan", no_wrap=True)
     table.add_column("Title", style="magenta")
     table.add_column("User", style="green")
     table.add_column("Type", style="yellow")
+    if scores is not None:
+        table.add_column("Score", style="blue", justify="right")
     # table.add_column("URL", style="blue") # Link is in Title
 
     for i, item in enumerate(items, 1):
@@ -152,19 +224,63 @@ def display_results_table(items):
         # Create clickable link
         display_title = f"[link={url}]{title}[/link]"
 
-        table.add_row(str(i), display_title, user, type_str)
+        row = [str(i), display_title, user, type_str]
+        if scores is not None:
+            row.append(f"{scores[i-1]:.3f}")
+        table.add_row(*row)
+
+    console.print(table)
+
+def display_facets(facets, tag=""):
+    if tag:
+        table = Table(title=f"Tags co-occurring with '{tag}' ({facets.tag_counts.get(tag.lower(), 0)} items)")
+        table.add_column("Tag", style="magenta")
+        table.add_column("Count", style="cyan", justify="right")
+        for name, count in facets.cooccurring(tag, n=20):
+            table.add_row(name, str(count))
+        console.print(table)
+        return
+
+    console.print(f"[bold]Facets for {facets.item_count} items[/bold]")
+
+    table = Table(title="Top tags")
+    table.add_column("Tag", style="magenta")
+    table.add_column("Count", style="cyan", justify="right")
+    for name, count in facets.top_tags():
+        table.add_row(name, str(count))
+    console.print(table)
 
+    table = Table(title="Top authors")
+    table.add_column("User", style="green")
+    table.add_column("Count", style="cyan", justify="right")
+    for user, count in facets.top_authors():
+        table.add_row(user, str(count))
     console.print(table)
 
-def handle_selection(client, items, indices):
+    table = Table(title="Top tag pairs")
+    table.add_column("Tags", style="magenta")
+    table.add_column("Count", style="cyan", justify="right")
+    for (a, b), count in facets.top_pairs():
+        table.add_row(f"{a} + {b}", str(count))
+    console.print(table)
+
+def handle_selection(client, items, indices, indexes=()):
+    """Unlike/unstock the selected items.
+
+    Items that end up neither liked nor stocked are removed from every
+    index in `indexes` (anything with a remove(item) method, e.g. TagFacets)
+    and returned so the caller can drop them from its lists.
+    """
+    removed = []
     selected_items = []
-    for idx in indices:
+    # Entering the same number twice must not act on (or un-index) an item twice
+    for idx in dict.fromkeys(indices):
         if 1 <= idx <= len(items):
             selected_items.append(items[idx-1])
 
     if not selected_items:
         console.print("[yellow]No valid items selected.[/yellow]")
-        return
+        return removed
 
     console.print(f"[bold]Selected {len(selected_items)} items:[/bold]")
     for item in selected_items:
@@ -173,7 +289,7 @@ def handle_selection(client, items, indices):
     confirm = console.input("[bold red]Are you sure you want to unlike/unstock these items? (y/N):[/bold red] ")
     if confirm.lower() != 'y':
         console.print("Cancelled.")
-        return
+        return removed
 
     for item in selected_items:
         item_id = item['id']
@@ -200,9 +316,13 @@ def handle_selection(client, items, indices):
             else:
                  console.print(f"[red]Failed to unstock: {item.get('title')}[/red]")
 
-        if not item.get('is_like') and not item.get('is_stock'):
-            # Removed completely
-            pass
+        if success and not item.get('is_like') and not item.get('is_stock'):
+            # Removed completely by this call
+            for index in indexes:
+                index.remove(item)
+            removed.append(item)
+
+    return removed
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,85 @@
+import numpy as np
+from scipy import sparse
+
+try:
+    from facets import tag_names
+except ImportError:
+    from .facets import tag_names
+
+
+class SimilarityIndex:
+    """TF-IDF weighted tag (and optionally title n-gram) similarity over items.
+
+    The sparse item x feature matrix is built once; each query is a single
+    sparse matrix-vector product against the query item's row.
+    """
+
+    def __init__(self, items, title_ngrams=False, ngram_size=2, title_weight=0.5):
+        self.items = list(items)
+        self.title_ngrams = title_ngrams
+        self.ngram_size = ngram_size
+        self.title_weight = title_weight
+        self.row_by_id = {item['id']: row for row, item in enumerate(self.items)}
+        # Rows of items that were unliked/unstocked are masked out of results
+        self.active = np.ones(len(self.items), dtype=bool)
+        self.matrix = self._build_matrix()
+
+    def _features(self, item):
+        features = {'tag:' + name: 1.0 for name in tag_names(item)}
+
+        if self.title_ngrams:
+            title = ' '.join((item.get('title') or '').lower().split())
+            # Character n-grams, since Japanese titles have no word boundaries
+            for i in range(len(title) - self.ngram_size + 1):
+                key = 'title:' + title[i:i + self.ngram_size]
+                features[key] = features.get(key, 0.0) + self.title_weight
+        return features
+
+    def _build_matrix(self):
+        vocabulary = {}
+        indptr = [0]
+        indices = []
+        data = []
+        for item in self.items:
+            for key, value in self._features(item).items():
+                indices.append(vocabulary.setdefault(key, len(vocabulary)))
+                data.append(value)
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(self.items), len(vocabulary)),
+        )
+
+        # Smoothed IDF, as in scikit-learn's TfidfVectorizer
+        n_items = len(self.items)
+        df = np.bincount(matrix.indices, minlength=len(vocabulary))
+        idf = np.log((1 + n_items) / (1 + df)) + 1
+        matrix.data *= idf[matrix.indices].astype(np.float32)
+
+        # L2-normalize rows so the dot product is the cosine similarity
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        matrix = sparse.diags((1 / norms).astype(np.float32)) @ matrix
+        return matrix.tocsr()
+
+    def remove(self, item):
+        row = self.row_by_id.get(item['id'])
+        if row is not None:
+            self.active[row] = False
+
+    def similar(self, item, n=20):
+        """Return up to n (item, score) pairs most similar to item, best first."""
+        row = self.row_by_id.get(item['id'])
+        if row is None:
+            return []
+
+        scores = self.matrix @ self.matrix[row].toarray().ravel()
+        scores[~self.active] = 0
+        scores[row] = 0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > n:
+            candidates = candidates[np.argpartition(scores[candidates], -n)[-n:]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.items[i], float(scores[i])) for i in candidates]
@@ -0,0 +1,52 @@
+import unittest
+from src.facets import TagFacets, tag_names
+
+
+class TestTagFacets(unittest.TestCase):
+    def setUp(self):
+        self.items = [
+            {'id': "a", 'user': {'id': "alice"}, 'tags': [{'name': "Rust"}, {'name': "WebAssembly"}]},
+            {'id': "b", 'user': {'id': "bob"}, 'tags': [{'name': "rust"}, {'name': "Python"}]},
+            {'id': "c", 'user': {'id': "alice"}, 'tags': [{'name': "Python"}, {'name': "WebAssembly"}, {'name': "rust"}]},
+        ]
+        self.facets = TagFacets(self.items)
+
+    def test_counts(self):
+        self.assertEqual(self.facets.item_count, 3)
+        self.assertEqual(self.facets.top_tags(1), [("rust", 3)])
+        self.assertEqual(self.facets.top_authors(1), [("alice", 2)])
+
+    def test_cooccurring_is_case_insensitive(self):
+        cooc = dict(self.facets.cooccurring("RUST"))
+        self.assertEqual(cooc, {"python": 2, "webassembly": 2})
+        self.assertEqual(self.facets.cooccurring("unknown"), [])
+
+    def test_top_pairs(self):
+        pairs = dict(self.facets.top_pairs())
+        self.assertEqual(pairs[("python", "rust")], 2)
+        self.assertEqual(pairs[("python", "webassembly")], 1)
+        self.assertNotIn(("rust", "python"), pairs)
+
+    def test_remove_matches_rebuild(self):
+        self.facets.remove(self.items[2])
+        rebuilt = TagFacets(self.items[:2])
+
+        self.assertEqual(self.facets.item_count, rebuilt.item_count)
+        self.assertEqual(self.facets.tag_counts, rebuilt.tag_counts)
+        self.assertEqual(self.facets.author_counts, rebuilt.author_counts)
+        self.assertEqual(dict(self.facets.cooccurrence), dict(rebuilt.cooccurrence))
+        self.assertNotIn("webassembly", self.facets.cooccurring("python"))
+
+    def test_item_without_tags(self):
+        facets = TagFacets([{'id': "x"}])
+        self.assertEqual(facets.item_count, 1)
+        self.assertEqual(facets.top_authors(), [("unknown", 1)])
+        self.assertEqual(facets.top_tags(), [])
+
+    def test_tag_names(self):
+        item = {'tags': [{'name': "Rust"}, {'name': "rust"}, {'name': ""}, {}, {'name': "Go"}]}
+        self.assertEqual(tag_names(item), ["go", "rust"])
+        self.assertEqual(tag_names({}), [])
+
+if __name__ == '__main__':
+    unittest.main()
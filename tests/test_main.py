@@ -0,0 +1,185 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from src import main
+from src.facets import TagFacets
+from src.similarity import SimilarityIndex
+
+
+class TestHandleSelection(unittest.TestCase):
+    def setUp(self):
+        self.items = [
+            {'id': "a", 'title': "Rust A", 'user': {'id': "alice"}, 'is_stock': True,
+             'tags': [{'name': "Rust"}, {'name': "WebAssembly"}]},
+            {'id': "b", 'title': "Rust B", 'user': {'id': "bob"}, 'is_like': True, 'is_stock': True,
+             'tags': [{'name': "Rust"}, {'name': "WebAssembly"}]},
+        ]
+        self.client = MagicMock()
+        self.client.unlike_item.return_value = True
+        self.client.unstock_item.return_value = True
+
+    def assertFacetsEqual(self, facets, expected):
+        self.assertEqual(facets.item_count, expected.item_count)
+        self.assertEqual(facets.tag_counts, expected.tag_counts)
+        self.assertEqual(facets.author_counts, expected.author_counts)
+        self.assertEqual(dict(facets.cooccurrence), dict(expected.cooccurrence))
+
+    @patch.object(main.console, 'input', return_value='y')
+    def test_removal_updates_indexes(self, mock_input):
+        all_facets = TagFacets(self.items)
+        current_facets = TagFacets(self.items[:1])
+
+        removed = main.handle_selection(self.client, self.items, [1], [all_facets, current_facets])
+
+        self.assertEqual(removed, [self.items[0]])
+        self.client.unstock_item.assert_called_once_with("a")
+        self.client.unlike_item.assert_not_called()
+        self.assertFacetsEqual(all_facets, TagFacets(self.items[1:]))
+        self.assertFacetsEqual(current_facets, TagFacets([]))
+
+    @patch.object(main.console, 'input', return_value='y')
+    def test_duplicate_indices_remove_once(self, mock_input):
+        facets = TagFacets(self.items)
+
+        removed = main.handle_selection(self.client, self.items, [1, 1], [facets])
+
+        self.assertEqual(removed, [self.items[0]])
+        self.assertEqual(self.client.unstock_item.call_count, 1)
+        self.assertFacetsEqual(facets, TagFacets(self.items[1:]))
+
+    @patch.object(main.console, 'input', return_value='y')
+    def test_removal_updates_similarity_index(self, mock_input):
+        index = SimilarityIndex(self.items)
+        self.assertEqual([item['id'] for item, _ in index.similar(self.items[1])], ["a"])
+
+        main.handle_selection(self.client, self.items, [1, 1], [index])
+
+        self.assertEqual(index.similar(self.items[1]), [])
+
+    @patch.object(main.console, 'input', return_value='y')
+    def test_partial_failure_keeps_item(self, mock_input):
+        self.client.unstock_item.return_value = False
+        facets = TagFacets(self.items)
+
+        removed = main.handle_selection(self.client, self.items, [2], [facets])
+
+        self.assertEqual(removed, [])
+        self.assertFacetsEqual(facets, TagFacets(self.items))
+
+    @patch.object(main.console, 'input', return_value='n')
+    def test_cancel(self, mock_input):
+        facets = TagFacets(self.items)
+        self.assertEqual(main.handle_selection(self.client, self.items, [1], [facets]), [])
+        self.client.unstock_item.assert_not_called()
+        self.assertEqual(facets.item_count, 2)
+
+
+class TestMainFacets(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.get_all_stocks.return_value = [
+            {'id': "a", 'title': "Rust A", 'url': "u", 'user': {'id': "alice"},
+             'tags': [{'name': "Rust"}, {'name': "WebAssembly"}]},
+        ]
+        self.client.get_all_likes.return_value = []
+
+    def run_main(self, argv):
+        with patch.object(main, 'QiitaClient', return_value=self.client), \
+             patch.object(main, 'display_facets') as mock_display, \
+             patch('sys.argv', ["main.py"] + argv):
+            main.main()
+        return mock_display
+
+    def test_facets_flag_does_not_consume_user_id(self):
+        mock_display = self.run_main(["--facets", "user1"])
+        self.client.get_all_stocks.assert_called_once_with("user1")
+        self.assertEqual(mock_display.call_args[0][1], "")
+
+    def test_one_shot_run_skips_similarity_index(self):
+        with patch.object(main, 'SimilarityIndex') as mock_index:
+            self.run_main(["user1", "--facets"])
+        mock_index.assert_not_called()
+
+    def test_facet_tag(self):
+        mock_display = self.run_main(["user1", "--facet-tag", "rust"])
+        facets, tag = mock_display.call_args[0]
+        self.assertEqual(tag, "rust")
+        self.assertEqual(facets.item_count, 1)
+
+
+class TestMainSimilar(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.get_all_stocks.return_value = [
+            {'id': "a", 'title': "Rust A", 'url': "u", 'user': {'id': "alice"},
+             'tags': [{'name': "Rust"}, {'name': "WebAssembly"}]},
+            {'id': "b", 'title': "Rust B", 'url': "u", 'user': {'id': "bob"},
+             'tags': [{'name': "Rust"}, {'name': "WebAssembly"}]},
+            {'id': "c", 'title': "Rust C", 'url': "u", 'user': {'id': "bob"},
+             'tags': [{'name': "Rust"}, {'name': "Python"}]},
+        ]
+        self.client.get_all_likes.return_value = []
+        self.client.unstock_item.return_value = True
+
+    def test_facets_command_does_not_shadow_searches(self):
+        inputs = ["f sharp", "facets rust", "q"]
+        with patch.object(main, 'QiitaClient', return_value=self.client), \
+             patch.object(main, 'display_results_table') as mock_results, \
+             patch.object(main, 'display_facets') as mock_facets, \
+             patch.object(main.console, 'input', side_effect=inputs), \
+             patch('sys.argv', ["main.py", "user1"]):
+            main.main()
+
+        # "f sharp" is a search (no hits), "facets rust" opens the facets view
+        self.assertEqual(mock_results.call_args_list[1][0][0], [])
+        mock_facets.assert_called_once()
+        self.assertEqual(mock_facets.call_args[0][1], "rust")
+
+    def test_find_similar_out_of_range(self):
+        items = self.client.get_all_stocks.return_value
+        index = SimilarityIndex(items)
+        self.assertIsNone(main.find_similar(index, items, 0))
+        self.assertIsNone(main.find_similar(index, items, 4))
+
+        similar_items, scores = main.find_similar(index, items, 1)
+        self.assertEqual([item['id'] for item in similar_items], ["b", "c"])
+        self.assertEqual(len(scores), 2)
+
+    def run_main(self, argv):
+        with patch.object(main, 'QiitaClient', return_value=self.client), \
+             patch.object(main, 'display_results_table') as mock_display, \
+             patch('sys.argv', ["main.py"] + argv):
+            main.main()
+        return mock_display
+
+    def test_similar_flag(self):
+        mock_display = self.run_main(["user1", "--similar", "1"])
+        items, scores = mock_display.call_args[0]
+        self.assertEqual([item['id'] for item in items], ["b", "c"])
+        self.assertGreater(scores[0], scores[1])
+
+    def test_similar_flag_numbers_search_results(self):
+        mock_display = self.run_main(["user1", "--search", "Rust C", "--similar", "1"])
+        items, _ = mock_display.call_args[0]
+        self.assertEqual([item['id'] for item in items], ["a", "b"])
+
+    def test_similar_flag_out_of_range(self):
+        mock_display = self.run_main(["user1", "--similar", "9"])
+        mock_display.assert_not_called()
+
+    def test_unstock_from_similar_view_keeps_scores(self):
+        inputs = ["similar 1", "1", "y", "q"]
+        with patch.object(main, 'QiitaClient', return_value=self.client), \
+             patch.object(main, 'display_results_table') as mock_display, \
+             patch.object(main.console, 'input', side_effect=inputs), \
+             patch('sys.argv', ["main.py", "user1"]):
+            main.main()
+
+        self.client.unstock_item.assert_called_once_with("b")
+        similar_items, similar_scores = mock_display.call_args_list[1][0]
+        self.assertEqual([item['id'] for item in similar_items], ["b", "c"])
+        items, scores = mock_display.call_args_list[2][0]
+        self.assertEqual([item['id'] for item in items], ["c"])
+        self.assertEqual(scores, similar_scores[1:])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from src.similarity import SimilarityIndex
+
+
+class TestSimilarityIndex(unittest.TestCase):
+    def setUp(self):
+        self.items = [
+            {'id': "a", 'title': "Rustで始めるWebAssembly", 'tags': [{'name': "Rust"}, {'name': "WebAssembly"}, {'name': "JavaScript"}]},
+            {'id': "b", 'title': "RustとWebAssembly入門", 'tags': [{'name': "rust"}, {'name': "WebAssembly"}]},
+            {'id': "c", 'title': "JavaScript Tips", 'tags': [{'name': "JavaScript"}]},
+            {'id': "d", 'title': "Python入門", 'tags': [{'name': "Python"}]},
+        ]
+        self.index = SimilarityIndex(self.items)
+
+    def test_ranks_by_tag_overlap(self):
+        results = self.index.similar(self.items[0])
+        ids = [item['id'] for item, _ in results]
+        self.assertEqual(ids, ["b", "c"])
+        self.assertGreater(results[0][1], results[1][1])
+
+    def test_excludes_self_and_unrelated(self):
+        ids = [item['id'] for item, _ in self.index.similar(self.items[3])]
+        self.assertEqual(ids, [])
+
+    def test_remove_masks_item(self):
+        self.index.remove(self.items[1])
+        ids = [item['id'] for item, _ in self.index.similar(self.items[0])]
+        self.assertEqual(ids, ["c"])
+
+    def test_limit(self):
+        results = self.index.similar(self.items[0], n=1)
+        self.assertEqual([item['id'] for item, _ in results], ["b"])
+
+    def test_title_ngrams(self):
+        items = [
+            {'id': "a", 'title': "Docker入門", 'tags': []},
+            {'id': "b", 'title': "Docker入門その2", 'tags': []},
+            {'id': "c", 'title': "Python", 'tags': []},
+        ]
+        self.assertEqual(SimilarityIndex(items).similar(items[0]), [])
+
+        index = SimilarityIndex(items, title_ngrams=True)
+        ids = [item['id'] for item, _ in index.similar(items[0])]
+        self.assertEqual(ids, ["b"])
+
+    def test_unknown_item(self):
+        self.assertEqual(self.index.similar({'id': "missing"}), [])
+
+if __name__ == '__main__':
+    unittest.main()